@@ -1,16 +1,45 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-import pandas as pd
 import numpy as np
-import json
+import orjson
+import os
+from functools import lru_cache
 
-# Load telemetry once at startup
-with open("telemetry.json") as f:
-    telemetry_data = json.load(f)
-df = pd.DataFrame(telemetry_data)
+# Per-region latency/uptime columns, keyed by region name
+def _build_region_index(records):
+    columns = {}
+    for rec in records:
+        lat, up = columns.setdefault(rec["region"], ([], []))
+        lat.append(rec["latency_ms"])
+        up.append(rec["uptime_pct"])
+    return {
+        region: (np.asarray(lat, dtype=np.float64), np.asarray(up, dtype=np.float64))
+        for region, (lat, up) in columns.items()
+    }
 
-app = FastAPI(title="eShopCo Latency Metrics")
+# Load telemetry once at startup; the raw records are dropped as soon as
+# the columns are built
+with open("telemetry.json", "rb") as f:
+    REGION_INDEX = _build_region_index(orjson.loads(f.read()))
+
+# Everything except breaches is independent of the threshold, so compute it
+# once here and leave a single binary search per (region, threshold).
+REGION_SUMMARY = {
+    region: {
+        "avg_latency": round(float(lat.mean()), 2),
+        "p95_latency": round(float(np.percentile(lat, 95)), 2),
+        "avg_uptime": round(float(up.mean()), 2),
+    }
+    for region, (lat, up) in REGION_INDEX.items()
+}
+
+# Sorted copies of each region's latencies for counting breaches by
+# binary search
+SORTED_LATENCY = {region: np.sort(lat) for region, (lat, up) in REGION_INDEX.items()}
+
+app = FastAPI(title="eShopCo Latency Metrics", default_response_class=ORJSONResponse)
 
 # Enable CORS
 app.add_middleware(
@@ -25,13 +54,50 @@ class MetricsRequest(BaseModel):
     regions: list[str]
     threshold_ms: float
 
+# Telemetry never changes after startup, so results for known regions are a
+# pure function of (region, threshold) and can be cached across requests.
+@lru_cache(maxsize=4096)
+def region_metrics(region, threshold_ms):
+    # Everything right of threshold in the sorted latencies is a breach
+    sorted_lat = SORTED_LATENCY[region]
+    breaches = sorted_lat.size - np.searchsorted(sorted_lat, threshold_ms, side="right")
+
+    return {**REGION_SUMMARY[region], "breaches": int(breaches)}
+
+# Optional SLO tiers (e.g. SLO_THRESHOLDS=150,200,250) are evaluated for every
+# region at startup into a fixed table that, unlike the LRU cache, never
+# evicts, so tier thresholds are always served without any work.
+def _parse_thresholds(raw):
+    thresholds = []
+    for part in raw.split(","):
+        if not part.strip():
+            continue
+        try:
+            thresholds.append(float(part))
+        except ValueError:
+            raise ValueError(
+                f"SLO_THRESHOLDS must be comma-separated numbers, got {raw!r}"
+            ) from None
+    return thresholds
+
+def _precompute_tiers(thresholds):
+    # Bypass the LRU cache so the table doesn't also take up its slots
+    return {
+        (region, threshold): region_metrics.__wrapped__(region, threshold)
+        for region in REGION_INDEX
+        for threshold in thresholds
+    }
+
+SLO_THRESHOLDS = _parse_thresholds(os.environ.get("SLO_THRESHOLDS", ""))
+PRECOMPUTED = _precompute_tiers(SLO_THRESHOLDS)
+
 @app.post("/api/metrics")
 def compute_metrics(request: MetricsRequest):
     result = {}
     for region in request.regions:
-        region_df = df[df["region"] == region]
-        if region_df.empty:
-            # If no data for region
+        if region not in SORTED_LATENCY:
+            # If no data for region; answered here so arbitrary names never
+            # reach the cache
             result[region] = {
                 "avg_latency": None,
                 "p95_latency": None,
@@ -39,16 +105,11 @@ def compute_metrics(request: MetricsRequest):
                 "breaches": 0
             }
             continue
-        
-        avg_latency = region_df["latency_ms"].mean()
-        p95_latency = np.percentile(region_df["latency_ms"], 95)
-        avg_uptime = region_df["uptime_pct"].mean()
-        breaches = (region_df["latency_ms"] > request.threshold_ms).sum()
-
-        result[region] = {
-            "avg_latency": round(avg_latency, 2),
-            "p95_latency": round(p95_latency, 2),
-            "avg_uptime": round(avg_uptime, 2),
-            "breaches": int(breaches)
-        }
+
+        key = (region, request.threshold_ms)
+        metrics = PRECOMPUTED.get(key)
+        if metrics is None:
+            metrics = region_metrics(*key)
+        # Copy so nothing downstream can mutate the shared cached dict
+        result[region] = dict(metrics)
     return result